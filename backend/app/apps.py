@@ -4,3 +4,18 @@ from django.apps import AppConfig
 class BudgetappConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'app'
+
+    def ready(self):
+        from . import serializers
+        from .utils.serializers import cache_fields
+
+        # Field dicts only depend on the serializer class, so build them
+        # once instead of on every request.
+        for serializer_class in (
+            serializers.BudgetSerializer,
+            serializers.BudgetCategoryGroupSerializer,
+            serializers.BudgetCategorySerializer,
+            serializers.TransactionSerializer,
+            serializers.PayeeSerializer,
+        ):
+            cache_fields(serializer_class)
@@ -0,0 +1,36 @@
+from django.db import migrations, models
+
+
+MONTHS = ('JAN', 'FEB', 'MAR', 'APR', 'MAY', 'JUN',
+          'JUL', 'AUG', 'SEP', 'OCT', 'NOV', 'DEC')
+
+
+def populate_month_index(apps, schema_editor):
+    # Older rows store full or lower-case names such as 'February' or 'march', so
+    # months are matched on their first three letters, as Budget.get_month_index does.
+    # Rows that still don't match any month keep a null month_index.
+    Budget = apps.get_model('app', 'Budget')
+    for month in Budget.objects.values_list('month', flat=True).distinct():
+        short_name = month[:3].upper()
+        if short_name in MONTHS:
+            Budget.objects.filter(month=month).update(month_index=MONTHS.index(short_name))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0003_transaction_date_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='budget',
+            name='month_index',
+            field=models.SmallIntegerField(editable=False, null=True),
+        ),
+        migrations.RunPython(populate_month_index, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='budget',
+            index=models.Index(fields=['owner', 'year', 'month_index'], name='budget_owner_year_monthidx_idx'),
+        ),
+    ]
@@ -1,8 +1,9 @@
 from datetime import datetime
 from decimal import Decimal
+from functools import cached_property
 
-from django.db import models
-from django.db.models import Sum
+from django.db import models, transaction
+from django.db.models import Q, Sum
 from django.db.models.functions import Coalesce
 
 
@@ -24,6 +25,9 @@ class Budget(models.Model):
     month = models.CharField(max_length=100, choices=MONTH_CHOICES, default='JAN')
     year = models.IntegerField(default=datetime.now().year)
     owner = models.ForeignKey('auth.User', related_name=related_name, on_delete=models.CASCADE)
+    # The month's index in MONTH_CHOICES, kept in sync with month by save() so budgets
+    # can be ordered chronologically in the database. Null if month isn't recognised.
+    month_index = models.SmallIntegerField(null=True, editable=False)
 
     # This method calculates the previous month's index and year, considering a wrap-around 
     # from January to December.
@@ -41,18 +45,89 @@ class Budget(models.Model):
             year -= 1
         return month_idx, year
     
-    # This property returns the previous month's budget for the same owner if it exists. 
-    @property
+    # This method returns the month's index in MONTH_CHOICES, or None if it isn't a month.
+    # Older rows store full or lower-case names such as 'February' or 'march', so only
+    # the first three letters are compared.
+    @classmethod
+    def get_month_index(cls, month):
+        return cls.MONTH_LOOKUP.get(month[:3].upper())
+
+    def save(self, *args, **kwargs):
+        self.month_index = self.get_month_index(self.month)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'month' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'month_index'}
+        super().save(*args, **kwargs)
+
+    # This property returns the most recent earlier budget for the same owner if one exists.
+    # It is cached on the instance, so the lookup runs at most once per Budget object.
+    @cached_property
     def previous(self):
-        # it uses the get_previous_month method to find the previous month and then queries the database.
-        month_idx, year = self.get_previous_month(self.MONTH_LOOKUP[self.month], self.year)
-        try:
-            return Budget.objects.get(owner=self.owner, year=year, month=self.MONTH_CHOICES[month_idx][0])
-        except Budget.DoesNotExist:
-            return None
+        # it orders by year and month_index, so the database finds it with a single indexed query.
+        # Budgets whose month isn't recognised can't be placed in that order, so they are skipped.
+        # Legacy rows can share a month ('FEB' and 'February'), so ties go to the newest row.
+        earlier = Q(year__lt=self.year)
+        if self.month_index is not None:
+            earlier |= Q(year=self.year, month_index__lt=self.month_index)
+        return (
+            Budget.objects
+            .filter(earlier, owner_id=self.owner_id, month_index__isnull=False)
+            .order_by('-year', '-month_index', '-pk')
+            .first()
+        )
+
+    # These properties flatten the budget's categories and transactions by walking its groups,
+    # so they reuse the collections prefetched by BudgetViewSet instead of re-querying.
+    @property
+    def all_budget_categories(self):
+        return [
+            category
+            for group in self.budget_category_groups.all()
+            for category in group.budget_categories.all()
+        ]
+
+    @property
+    def all_transactions(self):
+        return [
+            transaction
+            for category in self.all_budget_categories
+            for transaction in category.transactions.all()
+        ]
+
+    # This method copies the source budget's groups and categories into this budget, skipping any
+    # that already exist here. Rows are inserted with bulk_create, so the number of queries stays
+    # the same however many categories the source budget has.
+    @transaction.atomic
+    def copy_categories(self, source):
+        source_groups = list(source.budget_category_groups.prefetch_related('budget_categories'))
+        groups = {group.name: group for group in self.budget_category_groups.all()}
+        new_groups = BudgetCategoryGroup.objects.bulk_create([
+            BudgetCategoryGroup(budget=self, name=group.name)
+            for group in source_groups
+            if group.name not in groups
+        ])
+        groups.update((group.name, group) for group in new_groups)
+
+        # Category names are unique across the whole budget, not just within a group.
+        existing = set(
+            BudgetCategory.objects
+            .filter(group__budget=self)
+            .values_list('category', flat=True)
+        )
+        BudgetCategory.objects.bulk_create([
+            BudgetCategory(group=groups[group.name], category=category.category, limit=category.limit)
+            for group in source_groups
+            for category in group.budget_categories.all()
+            if category.category not in existing
+        ], batch_size=500)
+
     class Meta:
         # unique_together: Ensures that there is only one budget for each combination of owner, month, and year.
         unique_together = ('owner', 'month', 'year') 
+        # Covers listing an owner's budgets in date order, and finding the previous one.
+        indexes = [
+            models.Index(fields=['owner', 'year', 'month_index'], name='budget_owner_year_monthidx_idx'),
+        ]
 
     def __str__(self):
         return f"{self.owner.username}'s {self.month} {self.year} Budget"
@@ -78,6 +153,23 @@ class BudgetCategoryGroup(models.Model):
     def __str__(self):
         return f"{self.name} [owner={self.budget.owner.username}]"
 
+def sum_amounts(field):
+    """
+    Returns a Coalesce(Sum(field), 0) expression typed as a 2-place decimal, so the
+    database result comes back as a Decimal without further conversion.
+    """
+    output_field = models.DecimalField(max_digits=20, decimal_places=2)
+    return Coalesce(Sum(field, output_field=output_field), Decimal(0), output_field=output_field)
+
+
+class BudgetCategoryQuerySet(models.QuerySet):
+
+    # Annotates each category with the sum of its transactions, so that listing
+    # categories doesn't issue one aggregate query per category.
+    def with_spent(self):
+        return self.annotate(spent_agg=sum_amounts('transactions__amount'))
+
+
 class BudgetCategory(models.Model):
     related_name = 'budget_categories'
     category = models.CharField(max_length=100)
@@ -89,13 +181,24 @@ class BudgetCategory(models.Model):
     limit = models.DecimalField(
         max_digits=20, decimal_places=2, default=0
     )
+
+    objects = BudgetCategoryQuerySet.as_manager()
+
     # The spent property within the BudgetCategory class calculates the total amount spent within a specific budget category. 
+    # Uses the spent_agg annotation from BudgetCategoryQuerySet.with_spent() when present,
+    # then sums prefetched transactions in Python, and falls back to a per-instance
+    # aggregate query otherwise.
     @property
     def spent(self):
-        return Decimal(
+        spent_agg = getattr(self, 'spent_agg', None)
+        if spent_agg is not None:
+            return spent_agg
+        if 'transactions' in getattr(self, '_prefetched_objects_cache', {}):
+            return sum((t.amount for t in self.transactions.all()), Decimal(0))
+        return (
             Transaction.objects
             .filter(budget_category_id=self.pk)
-            .aggregate(spent=Coalesce(Sum('amount'), Decimal(0)))['spent']
+            .aggregate(spent=sum_amounts('amount'))['spent']
         )
 
     def __str__(self):
@@ -108,9 +211,13 @@ class Transaction(models.Model):
     """
     amount = models.DecimalField(max_digits=20, decimal_places=2)
     payee = models.ForeignKey('Payee', on_delete=models.CASCADE)
-    budget_category = models.ForeignKey('BudgetCategory', on_delete=models.CASCADE)
-    date = models.DateField()
-    
+    budget_category = models.ForeignKey(
+        'BudgetCategory',
+        on_delete=models.CASCADE,
+        related_name='transactions'
+    )
+    date = models.DateField(db_index=True)
+
     # This property provides a convenient way to access the owner of the transaction.
     @property
     def owner(self):
@@ -0,0 +1,10 @@
+from rest_framework.pagination import PageNumberPagination
+
+
+class StandardResultsSetPagination(PageNumberPagination):
+    """
+    Page number pagination with 100 results per page, for list endpoints whose
+    rows grow without bound, like categories and transactions. Querysets using
+    it must be ordered so pages are stable.
+    """
+    page_size = 100
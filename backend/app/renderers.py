@@ -0,0 +1,23 @@
+import orjson
+from rest_framework.renderers import JSONRenderer
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer that encodes with orjson instead of the stdlib json module.
+    DictSerializer keys responses by pk, so non-string keys are allowed.
+    Types orjson can't encode natively go through DRF's JSONEncoder, which
+    raises TypeError for anything it doesn't know either. An indent requested
+    in the Accept header is rendered as orjson's fixed two-space indent.
+    orjson writes NaN and Infinity as null, where DRF would raise with
+    STRICT_JSON; no serializer here renders float fields.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        option = orjson.OPT_NON_STR_KEYS
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, default=self.encoder_class().default, option=option)
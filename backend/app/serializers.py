@@ -1,9 +1,13 @@
+from operator import itemgetter
+
 from django.contrib.auth.models import User
+from django.db import transaction
 from rest_framework import serializers
 from rest_framework.utils.serializer_helpers import ReturnDict
 
 from .models import (Budget, BudgetCategory, BudgetCategoryGroup, Payee,
                      Transaction)
+from .utils.serializers import FastHyperlinkedIdentityField, get_requested_fields
 
 # Mixin for common fields
 class CommonFieldMixin:
@@ -46,16 +50,17 @@ class DictSerializer(serializers.ListSerializer):
         Converts the data from a list to a dictionary.
         """
         items = super(DictSerializer, self).to_representation(data) # method to get the serialized data as a list of dictionaries.
-        return {item[self.dict_key]: item for item in items}
+        # map/zip/dict build the result in C, without a Python frame per item.
+        return dict(zip(map(itemgetter(self.dict_key), items), items))
 
 
 class BudgetCategorySerializer(serializers.HyperlinkedModelSerializer, CommonFieldMixin):
-    url = serializers.HyperlinkedIdentityField(
+    url = FastHyperlinkedIdentityField(
         view_name='app:budgetcategory-detail')
     group = serializers.CharField(source='group.name')
     budget_month = serializers.CharField(write_only=True)
     budget_year = serializers.IntegerField(write_only=True)
-    spent = serializers.CharField(read_only=True)
+    spent = serializers.DecimalField(max_digits=20, decimal_places=2, read_only=True)
 
     def validate_uniqueness(self, data, budget_month, budget_year, category):
         existing = BudgetCategory.objects.filter(
@@ -132,8 +137,41 @@ class BudgetCategorySerializer(serializers.HyperlinkedModelSerializer, CommonFie
         list_serializer_class = DictSerializer
 
 
+class TransactionListSerializer(DictSerializer):
+    """
+    Creates a list of transactions with a single payee lookup and bulk
+    inserts, instead of a get_or_create per transaction.
+    """
+
+    @transaction.atomic
+    def create(self, validated_data):
+        owner = self.context['request'].user
+        names = {item['payee'] for item in validated_data}
+        payees = {
+            payee.name: payee
+            for payee in Payee.objects.filter(owner=owner, name__in=names)
+        }
+
+        # Create any payees that don't exist yet, then fetch them so their pks are known.
+        missing = names - payees.keys()
+        if missing:
+            Payee.objects.bulk_create(
+                [Payee(name=name, owner=owner) for name in missing],
+                ignore_conflicts=True
+            )
+            payees.update(
+                (payee.name, payee)
+                for payee in Payee.objects.filter(owner=owner, name__in=missing)
+            )
+
+        return Transaction.objects.bulk_create([
+            Transaction(**dict(item, payee=payees[item['payee']]))
+            for item in validated_data
+        ])
+
+
 class TransactionSerializer(serializers.HyperlinkedModelSerializer, CommonFieldMixin):
-    url = serializers.HyperlinkedIdentityField(
+    url = FastHyperlinkedIdentityField(
         view_name='app:transaction-detail')
     budget_category = serializers.PrimaryKeyRelatedField(
         queryset=BudgetCategory.objects.all(),
@@ -164,7 +202,7 @@ class TransactionSerializer(serializers.HyperlinkedModelSerializer, CommonFieldM
             'url', 'pk', 'amount', 'budget_category', 'date',
             'payee',
         )
-        list_serializer_class = DictSerializer
+        list_serializer_class = TransactionListSerializer
 
 
 
@@ -176,12 +214,31 @@ class PayeeSerializer(serializers.ModelSerializer):
         list_serializer_class = DictSerializer
 
 
+class OwnerPayeesSerializer(DictSerializer):
+    """
+    Serializes a user's payee_set once per request. Every budget in a response
+    belongs to the same owner, so later budgets reuse the first one's result.
+    """
+
+    def to_representation(self, data):
+        request = self.context.get('request')
+        owner = getattr(data, 'instance', None)
+        if request is None or owner is None:
+            return super().to_representation(data)
+
+        if not hasattr(request, '_payees_cache'):
+            request._payees_cache = {}
+        if owner.pk not in request._payees_cache:
+            request._payees_cache[owner.pk] = super().to_representation(data)
+        return request._payees_cache[owner.pk]
+
+
 class BudgetCategoryGroupListSerializer(DictSerializer):
     dict_key = 'name'
 
 
 class BudgetCategoryGroupSerializer(serializers.HyperlinkedModelSerializer, CommonFieldMixin):
-    url = serializers.HyperlinkedIdentityField(
+    url = FastHyperlinkedIdentityField(
         view_name='app:budgetcategorygroup-detail')
     budget = serializers.HyperlinkedRelatedField(
         queryset=Budget.objects.all(),
@@ -198,47 +255,41 @@ class BudgetCategoryGroupSerializer(serializers.HyperlinkedModelSerializer, Comm
         list_serializer_class = BudgetCategoryGroupListSerializer
 
 class BudgetSerializer(serializers.HyperlinkedModelSerializer, CommonFieldMixin):
-    url = serializers.HyperlinkedIdentityField(
+    url = FastHyperlinkedIdentityField(
         view_name='app:budget-detail')
     owner = CommonFieldMixin.owner_field
+    # Nested serializers are bound once per BudgetSerializer, and a list response
+    # shares one child BudgetSerializer, so every budget reuses the same instances.
     budget_category_groups = BudgetCategoryGroupSerializer(
         many=True,
         read_only=True
     )
-    budget_categories = serializers.SerializerMethodField()
-    transactions = serializers.SerializerMethodField()
-    payees = serializers.SerializerMethodField()
-
-    def get_budget_categories(self, budget):
-        budget_cats = BudgetCategory.objects.filter(
-            group__budget__pk=budget.pk)
-        serializer = BudgetCategorySerializer(
-            budget_cats,
-            many=True,
-            context={'request': self.context['request']}
-        )
-        return serializer.data
-
-    def get_transactions(self, budget):
-        transactions = Transaction.objects.filter(
-            budget_category__group__budget__pk=budget.pk)
-        serializer = TransactionSerializer(
-            transactions,
-            many=True,
-            context={'request': self.context['request']}
-        )
-        return serializer.data
+    budget_categories = BudgetCategorySerializer(
+        source='all_budget_categories',
+        many=True,
+        read_only=True
+    )
+    transactions = TransactionSerializer(
+        source='all_transactions',
+        many=True,
+        read_only=True
+    )
+    payees = OwnerPayeesSerializer(
+        child=PayeeSerializer(),
+        source='owner.payee_set',
+        read_only=True
+    )
 
-    def get_payees(self, budget):
-        payees = Payee.objects.filter(
-            owner=self.context['request'].user,
-        )
-        serializer = PayeeSerializer(
-            payees,
-            many=True,
-            context={'request': self.context['request']}
-        )
-        return serializer.data
+    def __init__(self, *args, **kwargs):
+        """
+        Drops any field not listed in the request's `fields` query parameter,
+        e.g. `?fields=pk,month,year`, so unrequested nested data isn't rendered.
+        """
+        super().__init__(*args, **kwargs)
+        requested = get_requested_fields(self.context.get('request'))
+        if requested is not None:
+            for name in set(self.fields) - requested:
+                self.fields.pop(name)
 
     class Meta:
         model = Budget
@@ -251,7 +302,7 @@ class CopyBudgetSerializer(serializers.Serializer):
     source = serializers.PrimaryKeyRelatedField(
         queryset=Budget.objects.all(), required=False)
     target_year = serializers.IntegerField()
-    target_month = serializers.CharField()
+    target_month = serializers.ChoiceField(choices=Budget.MONTH_CHOICES)
 
     def validate_source(self, value):
         if value and value.owner != self.context['request'].user:
@@ -272,10 +323,8 @@ class UserSerializer(serializers.HyperlinkedModelSerializer):
         }
 
     def create(self, validated_data):
-        user = User(
-            email=validated_data['email'],
-            username=validated_data['username']
-        )
-        user.set_password(validated_data['password'])
-        user.save()
-        return user
\ No newline at end of file
+        return User.objects.create_user(
+            username=validated_data['username'],
+            email=validated_data.get('email'),
+            password=validated_data['password']
+        )
\ No newline at end of file
@@ -1,3 +1,377 @@
-from django.test import TestCase
+from datetime import date
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import IntegrityError
+from django.urls import reverse
+from rest_framework import serializers, status
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory, APITestCase
+
+from .models import (Budget, BudgetCategory, BudgetCategoryGroup, Payee,
+                     Transaction)
+from .renderers import ORJSONRenderer
+from .utils.serializers import FastHyperlinkedIdentityField
+
+
+class BudgetTestMixin:
+    """
+    Creates a user with an authenticated client, plus helpers to build budgets.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='owner', password='password')
+        self.client.force_authenticate(self.user)
+
+    def create_category(self, budget, group='Living', category='Rent', limit=100):
+        group, created = BudgetCategoryGroup.objects.get_or_create(budget=budget, name=group)
+        return BudgetCategory.objects.create(group=group, category=category, limit=limit)
+
+    def create_transaction(self, category, amount=10, payee='Landlord'):
+        payee, created = Payee.objects.get_or_create(name=payee, owner=self.user)
+        return Transaction.objects.create(
+            budget_category=category, payee=payee, amount=amount, date=date(2024, 1, 1))
+
+
+class CopyBudgetTests(BudgetTestMixin, APITestCase):
+    url = reverse('app:budget-copy-budget')
+
+    def test_copies_categories_from_previous_budget(self):
+        source = Budget.objects.create(owner=self.user, year=2024, month='JAN')
+        self.create_transaction(self.create_category(source))
+
+        response = self.client.post(self.url, {'target_year': 2024, 'target_month': 'FEB'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        target = Budget.objects.get(owner=self.user, year=2024, month='FEB')
+        self.assertEqual(
+            list(BudgetCategory.objects.filter(group__budget=target).values_list('group__name', 'category', 'limit')),
+            [('Living', 'Rent', 100)]
+        )
+        self.assertEqual(BudgetCategory.objects.filter(group__budget=source).count(), 1)
+        self.assertEqual(Transaction.objects.count(), 1)
+
+    def test_copy_keeps_existing_target_categories_and_transactions(self):
+        source = Budget.objects.create(owner=self.user, year=2024, month='JAN')
+        self.create_category(source, category='Rent')
+        self.create_category(source, category='Power')
+        target = Budget.objects.create(owner=self.user, year=2024, month='FEB')
+        rent = self.create_category(target, category='Rent')
+        self.create_transaction(rent)
+
+        response = self.client.post(
+            self.url, {'target_year': 2024, 'target_month': 'FEB', 'source': source.pk})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertQuerySetEqual(
+            BudgetCategory.objects.filter(group__budget=target).order_by('category'),
+            ['Power', 'Rent'],
+            transform=lambda category: category.category
+        )
+        self.assertTrue(BudgetCategory.objects.filter(pk=rent.pk).exists())
+        self.assertEqual(rent.transactions.count(), 1)
+
+    def test_copy_skips_category_that_exists_in_another_group(self):
+        source = Budget.objects.create(owner=self.user, year=2024, month='JAN')
+        self.create_category(source, group='Living', category='Rent')
+        target = Budget.objects.create(owner=self.user, year=2024, month='FEB')
+        self.create_category(target, group='Housing', category='Rent')
+
+        response = self.client.post(self.url, {'target_year': 2024, 'target_month': 'FEB'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            list(BudgetCategory.objects.filter(group__budget=target).values_list('group__name', 'category')),
+            [('Housing', 'Rent')]
+        )
+
+    def test_without_source_leaves_target_untouched(self):
+        target = Budget.objects.create(owner=self.user, year=2024, month='JAN')
+        category = self.create_category(target)
+        self.create_transaction(category)
+
+        response = self.client.post(self.url, {'target_year': 2024, 'target_month': 'JAN'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(BudgetCategory.objects.filter(pk=category.pk).exists())
+        self.assertEqual(Transaction.objects.filter(budget_category=category).count(), 1)
+
+
+class TransactionListCreateTests(BudgetTestMixin, APITestCase):
+    url = reverse('app:transaction-list')
+
+    def setUp(self):
+        super().setUp()
+        budget = Budget.objects.create(owner=self.user, year=2024, month='JAN')
+        self.category = self.create_category(budget)
+        self.landlord = Payee.objects.create(name='Landlord', owner=self.user)
+
+    def transaction_data(self, payee, amount='10.00'):
+        return {
+            'budget_category': self.category.pk, 'amount': amount,
+            'date': '2024-01-02', 'payee': payee,
+        }
+
+    def test_creates_list_with_new_and_existing_payees(self):
+        response = self.client.post(self.url, [
+            self.transaction_data('Landlord'),
+            self.transaction_data('Grocer', '5.00'),
+            self.transaction_data('Grocer', '7.50'),
+        ], format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(response.data), 3)
+        self.assertQuerySetEqual(
+            Payee.objects.filter(owner=self.user).order_by('name'),
+            ['Grocer', 'Landlord'],
+            transform=lambda payee: payee.name
+        )
+        self.assertEqual(Payee.objects.get(name='Landlord').pk, self.landlord.pk)
+        self.assertQuerySetEqual(
+            Transaction.objects.order_by('amount'),
+            [('Grocer', 5), ('Grocer', 7.5), ('Landlord', 10)],
+            transform=lambda transaction: (transaction.payee.name, transaction.amount)
+        )
+
+    def test_empty_list_creates_nothing(self):
+        response = self.client.post(self.url, [], format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data, {})
+        self.assertFalse(Transaction.objects.exists())
+
+    def test_failed_transaction_insert_rolls_back_new_payees(self):
+        with mock.patch.object(Transaction.objects, 'bulk_create', side_effect=IntegrityError):
+            with self.assertRaises(IntegrityError):
+                self.client.post(self.url, [self.transaction_data('Grocer')], format='json')
+
+        self.assertFalse(Payee.objects.filter(name='Grocer').exists())
+
+
+class BudgetFieldsTests(BudgetTestMixin, APITestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.budget = Budget.objects.create(owner=self.user, year=2024, month='JAN')
+        self.url = reverse('app:budget-detail', args=[self.budget.pk])
+
+    def test_get_renders_only_requested_fields(self):
+        response = self.client.get(self.url, {'fields': 'pk,month'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {'pk': self.budget.pk, 'month': 'JAN'})
+
+    def test_write_ignores_fields_parameter(self):
+        response = self.client.patch(f'{self.url}?fields=pk', {'month': 'MAR'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['month'], 'MAR')
+        self.budget.refresh_from_db()
+        self.assertEqual(self.budget.month, 'MAR')
+
+
+class BudgetPreviousTests(BudgetTestMixin, APITestCase):
+
+    def create_budget(self, year, month):
+        return Budget.objects.create(owner=self.user, year=year, month=month)
+
+    def test_previous_is_most_recent_earlier_budget(self):
+        self.create_budget(2023, 'JAN')
+        november = self.create_budget(2023, 'NOV')
+        self.create_budget(2024, 'APR')
+        march = self.create_budget(2024, 'MAR')
+
+        self.assertEqual(march.previous, november)
+
+    def test_previous_prefers_earlier_month_in_same_year(self):
+        self.create_budget(2023, 'DEC')
+        january = self.create_budget(2024, 'JAN')
+
+        self.assertEqual(self.create_budget(2024, 'JUN').previous, january)
+
+    def test_previous_ignores_other_owners(self):
+        other = User.objects.create_user(username='other', password='password')
+        Budget.objects.create(owner=other, year=2024, month='JAN')
+
+        self.assertIsNone(self.create_budget(2024, 'FEB').previous)
+
+    def test_legacy_month_names_are_ordered(self):
+        february = self.create_budget(2024, 'February')
+        self.create_budget(2024, 'march')
+
+        self.assertEqual(february.month_index, 1)
+        self.assertEqual(self.create_budget(2024, 'MAR').previous, february)
+
+    def test_previous_breaks_ties_within_a_month_by_newest_row(self):
+        self.create_budget(2023, 'February')
+        newest = self.create_budget(2023, 'FEB')
+
+        self.assertEqual(self.create_budget(2023, 'MAR').previous, newest)
+
+    def test_update_of_legacy_month_row(self):
+        budget = self.create_budget(2023, 'February')
+
+        response = self.client.patch(
+            reverse('app:budget-detail', args=[budget.pk]), {'year': 2025})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        budget.refresh_from_db()
+        self.assertEqual((budget.year, budget.month_index), (2025, 1))
+
+
+class ORJSONRendererTests(BudgetTestMixin, APITestCase):
+
+    def setUp(self):
+        super().setUp()
+        Payee.objects.create(name='Landlord', owner=self.user)
+        self.url = reverse('app:Payee-list')
+
+    def test_renders_compact_json(self):
+        response = self.client.get(self.url, HTTP_ACCEPT='application/json')
+
+        payee = Payee.objects.get()
+        self.assertEqual(response.content, f'{{"{payee.pk}":{{"pk":{payee.pk},"name":"Landlord"}}}}'.encode())
+
+    def test_honours_requested_indent(self):
+        response = self.client.get(self.url, HTTP_ACCEPT='application/json; indent=4')
+
+        self.assertIn(b'\n  "', response.content)
+
+    def test_options_renders_metadata(self):
+        response = self.client.options(reverse('app:budget-list'))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['name'], 'Budget List')
+
+    def test_unknown_types_raise(self):
+        with self.assertRaises(TypeError):
+            ORJSONRenderer().render({'value': object()})
+
+
+class PaginationTests(BudgetTestMixin, APITestCase):
+
+    def test_transactions_are_listed_a_page_at_a_time(self):
+        category = self.create_category(Budget.objects.create(owner=self.user, year=2024, month='JAN'))
+        for amount in range(101):
+            self.create_transaction(category, amount=amount)
+
+        response = self.client.get(reverse('app:transaction-list'))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 101)
+        self.assertEqual(len(response.data['results']), 100)
+        self.assertIsNotNone(response.data['next'])
+
+
+class QueryCountTests(BudgetTestMixin, APITestCase):
+    """
+    List endpoints run a fixed number of queries however many rows they render.
+    """
+
+    def setUp(self):
+        super().setUp()
+        for month in ('JAN', 'FEB', 'MAR'):
+            budget = Budget.objects.create(owner=self.user, year=2024, month=month)
+            for group in ('Living', 'Fun'):
+                for name in ('One', 'Two'):
+                    category = self.create_category(budget, group=group, category=f'{group} {name}')
+                    self.create_transaction(category, payee=f'{group} {name}')
+                    self.create_transaction(category, payee='Shop')
+
+    def test_budget_list(self):
+        # Budgets with owners, payees, groups, categories, transactions.
+        with self.assertNumQueries(5):
+            response = self.client.get(reverse('app:budget-list'))
+
+        self.assertEqual(len(response.data), 3)
+
+    def test_budget_list_with_pruned_fields(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('app:budget-list'), {'fields': 'pk,month'})
+
+        self.assertEqual(len(response.data), 3)
+
+    def test_budget_category_list(self):
+        # The page's count, then its categories with their spent annotation.
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('app:budgetcategory-list'))
+
+        self.assertEqual(response.data['count'], 12)
+
+
+class UserInfoCacheTests(BudgetTestMixin, APITestCase):
+    url = reverse('app:user-info')
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+    def test_repeat_requests_are_served_from_cache(self):
+        self.client.get(self.url)
+
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.data['username'], 'owner')
+
+    def test_update_clears_cached_user_info(self):
+        self.client.get(self.url)
+
+        response = self.client.patch(
+            reverse('app:user-detail', args=[self.user.pk]), {'email': 'new@example.com'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.user.refresh_from_db()
+        self.client.force_authenticate(self.user)
+        self.assertEqual(self.client.get(self.url).data['email'], 'new@example.com')
+
+
+class FastHyperlinkedIdentityFieldTests(APITestCase):
+    view_names = {
+        'app:budget-detail': Budget,
+        'app:budgetcategory-detail': BudgetCategory,
+        'app:budgetcategorygroup-detail': BudgetCategoryGroup,
+        'app:transaction-detail': Transaction,
+    }
+
+    def assert_urls_match(self, request):
+        for view_name, model in self.view_names.items():
+            with self.subTest(view_name=view_name):
+                obj = model(pk=42)
+                fast_field = FastHyperlinkedIdentityField(view_name=view_name)
+                field = serializers.HyperlinkedIdentityField(view_name=view_name)
+                self.assertEqual(
+                    fast_field.get_url(obj, view_name, request, None),
+                    field.get_url(obj, view_name, request, None)
+                )
+
+    def test_matches_hyperlinked_identity_field(self):
+        self.assert_urls_match(Request(APIRequestFactory().get('/')))
+
+    def test_matches_hyperlinked_identity_field_without_request(self):
+        self.assert_urls_match(None)
+
+    def test_unsaved_object_has_no_url(self):
+        field = FastHyperlinkedIdentityField(view_name='app:budget-detail')
+
+        self.assertIsNone(field.get_url(Budget(), 'app:budget-detail', None, None))
+
+
+class UserCreateTests(APITestCase):
+    url = reverse('app:user-create')
+
+    def test_registers_user_with_hashed_password(self):
+        response = self.client.post(
+            self.url, {'username': 'new', 'email': 'new@example.com', 'password': 'secret-pass'})
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        user = User.objects.get(username='new')
+        self.assertEqual(user.email, 'new@example.com')
+        self.assertTrue(user.check_password('secret-pass'))
+
+    def test_registers_user_without_email(self):
+        response = self.client.post(self.url, {'username': 'new', 'password': 'secret-pass'})
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(User.objects.get(username='new').email, '')
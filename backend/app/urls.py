@@ -1,12 +1,12 @@
 from django.urls import include, path
-from rest_framework.routers import DefaultRouter
+from rest_framework.routers import SimpleRouter
 
 from . import views
 
 app_name = 'budgetapp'
 
-# DRF Router
-router = DefaultRouter()
+# DRF Router. SimpleRouter skips the browsable API root view and its URL patterns.
+router = SimpleRouter()
 router.register(r'budget', views.BudgetViewSet)
 router.register(r'budgetcategories', views.BudgetCategoryViewSet)
 router.register(r'budgetcategorygroups', views.BudgetCategoryGroupViewSet)
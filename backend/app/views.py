@@ -1,6 +1,8 @@
 
 from django.contrib.auth.models import User
 from django.contrib.auth.views import LoginView
+from django.core.cache import cache
+from django.db.models import Prefetch
 from django.http import HttpResponse, JsonResponse
 from rest_framework import generics, permissions, viewsets
 from rest_framework.authtoken.models import Token
@@ -12,10 +14,12 @@ from rest_framework import status
 
 
 from .models import Budget, BudgetCategory, BudgetCategoryGroup, Transaction, Payee
+from .pagination import StandardResultsSetPagination
 from .permissions import IsOwnerOrAdmin
 from .serializers import (BudgetCategoryGroupSerializer,
                           BudgetCategorySerializer, BudgetSerializer,
                           TransactionSerializer, PayeeSerializer, UserSerializer, CopyBudgetSerializer)
+from .utils.serializers import get_requested_fields
 
 
 
@@ -29,10 +33,46 @@ class BudgetViewSet(OwnershipFilterMixin, viewsets.ModelViewSet):
     queryset = Budget.objects.all()
     serializer_class = BudgetSerializer
     permission_classes = (permissions.IsAuthenticated, IsOwnerOrAdmin)
+    lookup_value_regex = '[0-9]+'
     filter_fields = ('month', 'year',)
 
     def get_queryset(self):
-        return Budget.objects.filter(owner=self.request.user)
+        # Load the nested groups, categories, transactions and payees rendered
+        # by BudgetSerializer in a fixed number of queries. Collections left
+        # out of the `fields` query parameter aren't rendered, so they aren't loaded.
+        requested = get_requested_fields(self.request)
+
+        def wants(*names):
+            return requested is None or not requested.isdisjoint(names)
+
+        prefetches = []
+        if wants('payees'):
+            prefetches.append(Prefetch(
+                'owner__payee_set',
+                queryset=Payee.objects.only('name', 'owner')
+            ))
+        if wants('budget_category_groups', 'budget_categories', 'transactions'):
+            categories = BudgetCategory.objects.only('category', 'limit', 'group')
+            # spent is summed in Python from the prefetched transactions, so
+            # the categories only need the with_spent() join without them.
+            if wants('budget_categories') and not wants('transactions'):
+                categories = categories.with_spent()
+            prefetches += [
+                'budget_category_groups',
+                Prefetch(
+                    'budget_category_groups__budget_categories',
+                    queryset=categories
+                ),
+            ]
+        if wants('transactions'):
+            prefetches.append(Prefetch(
+                'budget_category_groups__budget_categories__transactions',
+                queryset=Transaction.objects.select_related('payee').only(
+                    'amount', 'date', 'budget_category', 'payee__name')
+            ))
+
+        return Budget.objects.filter(owner=self.request.user).select_related(
+            'owner').prefetch_related(*prefetches)
     
     @action(detail=False, methods=['post'])
     def copy_budget(self, request):
@@ -44,12 +84,12 @@ class BudgetViewSet(OwnershipFilterMixin, viewsets.ModelViewSet):
             source = serializer.validated_data.get('source')
 
             # Logic to copy budget (reusing existing method)
-            self.copy_budget(target_year, target_month, request.user, source)
+            self.perform_copy_budget(target_year, target_month, request.user, source)
 
             return Response(status=status.HTTP_200_OK)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
     
-    def copy_budget(self, target_year, target_month, user, source=None):
+    def perform_copy_budget(self, target_year, target_month, user, source=None):
         target, created = Budget.objects.get_or_create(
             year=target_year,
             month=target_month,
@@ -60,13 +100,11 @@ class BudgetViewSet(OwnershipFilterMixin, viewsets.ModelViewSet):
         if not source:
             source = target.previous
 
-        # If there is a source budget, copy the categories. Otherwise,
-        # delete all categories, since the non-existing budget appears blank
-        # in the UI.
+        # If there is a source budget, copy the categories. Otherwise leave
+        # the target as it is, since deleting its categories would also
+        # delete their transactions.
         if source:
             target.copy_categories(source)
-        else:
-            target.delete_categories()
 
 
 
@@ -74,34 +112,63 @@ class BudgetCategoryGroupViewSet(OwnershipFilterMixin, viewsets.ModelViewSet):
     queryset = BudgetCategoryGroup.objects.all()
     serializer_class = BudgetCategoryGroupSerializer
     permission_classes = (permissions.IsAuthenticated, IsOwnerOrAdmin)
+    lookup_value_regex = '[0-9]+'
 
     def get_queryset(self):
-        return BudgetCategoryGroup.objects.filter(
-            budget__owner=self.request.user)
+        return BudgetCategoryGroup.objects.select_related(
+            'budget__owner').filter(budget__owner=self.request.user)
 
 
 class BudgetCategoryViewSet(OwnershipFilterMixin, viewsets.ModelViewSet):
     queryset = BudgetCategory.objects.all()
     serializer_class = BudgetCategorySerializer
     permission_classes = (permissions.IsAuthenticated, IsOwnerOrAdmin)
+    lookup_value_regex = '[0-9]+'
+    pagination_class = StandardResultsSetPagination
 
     def get_queryset(self):
-        return BudgetCategory.objects.filter(
-            group__budget__owner=self.request.user)
+        # BudgetCategorySerializer only renders the group's name, so the
+        # group is the only relation joined.
+        queryset = BudgetCategory.objects.filter(
+            group__budget__owner=self.request.user).with_spent().select_related('group')
+        if self.action == 'list':
+            # Listing only needs the columns BudgetCategorySerializer renders.
+            return queryset.only(
+                'category', 'limit', 'group__name').order_by('pk')
+        return queryset
 
 
 class TransactionViewSet(OwnershipFilterMixin, viewsets.ModelViewSet):
     queryset = Transaction.objects.all()
     serializer_class = TransactionSerializer
     permission_classes = (permissions.IsAuthenticated, IsOwnerOrAdmin)
+    lookup_value_regex = '[0-9]+'
+    pagination_class = StandardResultsSetPagination
 
     def get_queryset(self):
-        return Transaction.objects.filter(
+        queryset = Transaction.objects.filter(
             budget_category__group__budget__owner=self.request.user)
+        if self.action == 'list':
+            # Listing only needs the columns TransactionSerializer renders.
+            return queryset.select_related('payee').only(
+                'amount', 'date', 'budget_category', 'payee__name').order_by('pk')
+        return queryset.select_related(
+            'payee', 'budget_category__group__budget__owner')
+
+    def create(self, request, *args, **kwargs):
+        # A list of transactions is validated and inserted in bulk by
+        # TransactionListSerializer. Single objects use the default path.
+        if isinstance(request.data, list):
+            serializer = self.get_serializer(data=request.data, many=True)
+            serializer.is_valid(raise_exception=True)
+            self.perform_create(serializer)
+            return Response(serializer.data, status=status.HTTP_201_CREATED)
+        return super().create(request, *args, **kwargs)
     
 class PayeeViewSet(OwnershipFilterMixin, viewsets.ModelViewSet):
     serializer_class = PayeeSerializer
     permission_classes = (permissions.IsAuthenticated, IsOwnerOrAdmin)
+    lookup_value_regex = '[0-9]+'
 
     def get_queryset(self):
         return Payee.objects.filter(owner=self.request.user)
@@ -111,6 +178,30 @@ class PayeeViewSet(OwnershipFilterMixin, viewsets.ModelViewSet):
 
 
 
+# How long, in seconds, a user's serialized data is served from the cache. The
+# cache must be shared by every worker (see CACHES in settings), or an update
+# only clears the entry in the worker that handled it.
+USER_INFO_CACHE_TIMEOUT = 300
+
+
+def user_info_cache_key(user):
+    # The tail of the password hash changes with the password, so a password
+    # change also invalidates the cached data.
+    return f"user-info:{user.pk}:{user.password[-8:]}"
+
+
+def get_user_info(user, request):
+    """
+    Returns UserSerializer data for the given user, cached for a short time
+    since it rarely changes between requests.
+    """
+    return cache.get_or_set(
+        user_info_cache_key(user),
+        lambda: UserSerializer(user, context={'request': request}).data,
+        USER_INFO_CACHE_TIMEOUT
+    )
+
+
 class UserCreateView(generics.CreateAPIView):
     """
     Used to create a user. Anonymous users can use this.
@@ -130,6 +221,18 @@ class UserRetrieveUpdateDestroyView(generics.RetrieveUpdateDestroyAPIView):
     serializer_class = UserSerializer
     permission_classes = (permissions.IsAuthenticated, IsOwnerOrAdmin,)
 
+    # The cached user info is cleared after the write, so a request racing it
+    # can't refill the cache with the old data.
+    def perform_update(self, serializer):
+        key = user_info_cache_key(serializer.instance)
+        super().perform_update(serializer)
+        cache.delete(key)
+
+    def perform_destroy(self, instance):
+        key = user_info_cache_key(instance)
+        super().perform_destroy(instance)
+        cache.delete(key)
+
 
 class UserListView(generics.ListAPIView):
     """
@@ -152,8 +255,7 @@ class ObtainAuthTokenCookieView(ObtainAuthToken):
         serializer.is_valid(raise_exception=True)
         user = serializer.validated_data['user']
         token, created = Token.objects.get_or_create(user=user)
-        user_data = UserSerializer(user, context={'request': request})
-        response = JsonResponse(user_data.data)
+        response = JsonResponse(get_user_info(user, request))
         response.set_cookie(
             'Token',
             token.key,
@@ -167,8 +269,7 @@ class UserDetailView(APIView):
     permission_classes = (permissions.IsAuthenticated,)
 
     def get(self, request):
-        serializer = UserSerializer(request.user, context={'request': request})
-        return Response(serializer.data)
+        return Response(get_user_info(request.user, request))
 
 
 def logout(request):